@@ -5,65 +5,114 @@ Various utilities to handle running Steps from the commandline.
 import argparse
 import logging
 import os
-import os.path
 import textwrap
 import warnings
+import weakref
 
 from . import _log, config_parser, utilities
 from .exceptions import ValidationError
 from .step import Step, get_disable_crds_steppars
 
-built_in_configuration_parameters = [
+built_in_configuration_parameters = frozenset(
+    (
+        "debug",
+        "logcfg",
+        "verbose",
+        "log-level",
+        "log-file",
+        "log-stream",
+    )
+)
+
+# Destinations of the arguments added by _build_parent_arg_parser
+_PARENT_ARGUMENTS = (
+    "cfg_file_or_class",
     "debug",
+    "save_parameters",
+    "disable_crds_steppars",
     "logcfg",
     "verbose",
-    "log-level",
-    "log-file",
-    "log-stream",
-]
+    "log_level",
+    "log_file",
+    "log_stream",
+)
+
+# Extensions that mark a command line identifier as a config file path
+_CONFIG_FILE_EXTENSIONS = (".asdf", ".cfg", ".yaml", ".yml")
+
+# Spec defaults for which no default is shown in the argument help
+_NULL_DEFAULTS = frozenset(("None", "''", '""'))
 
 logger = logging.getLogger(__name__)
 
+# Argument parsers built from the merged configspec, keyed by Step class.
+# Parsing does not modify a parser so these are shared between invocations.
+# Entries are never invalidated, see `_clear_parser_cache`.
+_PARSER_CACHE = weakref.WeakKeyDictionary()
+
+
+_HEADER_WRAPPER = textwrap.TextWrapper()
+_MESSAGE_WRAPPER = textwrap.TextWrapper(
+    initial_indent="    ",
+    subsequent_indent="    ",
+)
+
 
 def _print_important_message(header, message, no_wrap=None):
     print("-" * 70)
-    print(textwrap.fill(header))
-    print(
-        textwrap.fill(
-            message,
-            initial_indent="    ",
-            subsequent_indent="    ",
-        )
-    )
+    print(_HEADER_WRAPPER.fill(header))
+    print(_MESSAGE_WRAPPER.fill(message))
     if no_wrap:
         print(no_wrap)
     print("-" * 70)
 
 
+def _config_and_class_from_file(identifier):
+    """
+    Load ``identifier`` as a config file, returning None if it does not
+    exist. Other errors opening the file are raised.
+    """
+    try:
+        config = config_parser._read_config_file(identifier)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+    step_class, name = Step._parse_class_and_name(config, config_file=identifier)
+    return step_class, config, name, identifier
+
+
 def _get_config_and_class(identifier):
     """
     Given a file path to a config file or Python module path, return a
     Step class and a configuration object.
     """
-    if os.path.exists(identifier):
-        config_file = identifier
-        config = config_parser.load_config_file(config_file)
-        step_class, name = Step._parse_class_and_name(config, config_file=config_file)
-    else:
-        try:
-            step_class = utilities.import_class(
-                utilities.resolve_step_class_alias(identifier), Step
-            )
-        except (ImportError, AttributeError, TypeError) as err:
-            raise ValueError(
-                f"{identifier!r} is not a path to a config file or a Python Step class"
-            ) from err
-        # Don't validate yet
-        config = config_parser.config_from_dict({})
-        name = None
-        config_file = None
+    # Most identifiers are Python class paths or aliases, so only go to
+    # the filesystem first when the identifier looks like a file path.
+    path_like = (
+        identifier.endswith(_CONFIG_FILE_EXTENSIONS)
+        or "/" in identifier
+        or os.sep in identifier
+    )
+    if path_like:
+        result = _config_and_class_from_file(identifier)
+        if result is not None:
+            return result
+
+    try:
+        step_class = utilities.import_class(
+            utilities.resolve_step_class_alias(identifier), Step
+        )
+    except (ImportError, AttributeError, TypeError) as err:
+        if not path_like:
+            result = _config_and_class_from_file(identifier)
+            if result is not None:
+                return result
+        raise ValueError(
+            f"{identifier!r} is not a path to a config file or a Python Step class"
+        ) from err
 
-    return step_class, config, name, config_file
+    # Don't validate yet
+    config = config_parser.config_from_dict({})
+    return step_class, config, None, None
 
 
 def _build_parent_arg_parser():
@@ -150,35 +199,40 @@ def _build_arg_parser_from_spec(spec, step_class, parent=None):
         description=step_class.__doc__,
     )
 
-    def build_from_spec(subspec, parts=None):
-        if parts is None:
-            parts = []
+    # Walk the spec depth-first, carrying the dotted prefix of each
+    # section. Sections list their scalars before their subsections, so
+    # pushing subsections in reverse keeps the arguments in spec order.
+    stack = [("", spec)]
+    while stack:
+        prefix, subspec = stack.pop()
+        get_comment = subspec.inline_comments.get
+        subsections = []
         for key, val in subspec.items():
+            name = prefix + key
             if isinstance(val, dict):
-                build_from_spec(val, [*parts, key])
+                subsections.append((name + ".", val))
+                continue
+            comment = get_comment(key) or ""
+            comment = comment.lstrip("#").strip()
+            # Only show default value if it is not None or the empty string
+            default_value_string = val.split("(")[1].rstrip(")").strip()
+            if default_value_string.removeprefix("default=") in _NULL_DEFAULTS:
+                help_string = comment
             else:
-                comment = subspec.inline_comments.get(key) or ""
-                comment = comment.lstrip("#").strip()
-                # Only show default value if it is not None or the empty string
-                default_value_string = val.split("(")[1].rstrip(")").strip()
-                if default_value_string.lstrip("default=") in ["None", "''", '""']:
-                    help_string = comment
-                else:
-                    help_string = f"{comment} [{default_value_string}]"
-                argument = "--" + ".".join([*parts, key])
-                if argument[2:] in built_in_configuration_parameters:
-                    raise ValueError(
-                        "The Step's spec is trying to override a built-in parameter"
-                        f" {argument!r}"
-                    )
-                parser.add_argument(
-                    "--" + ".".join([*parts, key]),
-                    type=str,
-                    help=help_string,
-                    metavar="",
+                help_string = f"{comment} [{default_value_string}]"
+            argument = "--" + name
+            if name in built_in_configuration_parameters:
+                raise ValueError(
+                    "The Step's spec is trying to override a built-in parameter"
+                    f" {argument!r}"
                 )
-
-    build_from_spec(spec)
+            parser.add_argument(
+                argument,
+                type=str,
+                help=help_string,
+                metavar="",
+            )
+        stack.extend(reversed(subsections))
 
     parser.add_argument(
         "args",
@@ -189,6 +243,38 @@ def _build_arg_parser_from_spec(spec, step_class, parent=None):
     return parser
 
 
+def _get_step_arg_parser(step_class, parent):
+    """
+    Return the argument parser for ``step_class``, building it from the
+    class configspec only on the first request for that class.
+
+    The arguments of ``parent`` are copied into the parser when it is
+    built, so any parent built by `_build_parent_arg_parser` will do.
+    """
+    try:
+        return _PARSER_CACHE[step_class]
+    except KeyError:
+        pass
+
+    # This creates a config object from the spec file of the step class merged with
+    # the spec files of the superclasses of the step class and adds arguments for
+    # all of the expected reference files
+
+    # The spec comes from the per-class cache shared with Step instances
+    spec = step_class._get_spec()
+
+    parser = _PARSER_CACHE[step_class] = _build_arg_parser_from_spec(
+        spec, step_class, parent=parent
+    )
+    return parser
+
+
+def _clear_parser_cache():
+    """Forget the cached argument parsers and the specs they were built from."""
+    _PARSER_CACHE.clear()
+    Step._clear_spec_cache()
+
+
 class FromCommandLine(str):
     """
     We need a way to distinguish between config values that come from
@@ -201,26 +287,23 @@ class FromCommandLine(str):
     """
 
 
-def _override_config_from_args(config, args):
+def _override_config_from_args(config, overrides):
     """
     Overrides any configuration values in `config` with values from the
-    parsed commandline arguments `args`.
+    commandline arguments `overrides`, a dict of the dotted argument
+    names that were set on the commandline and their values.
     """
-
-    def set_value(subconf, key, val):
-        root, sep, rest = key.partition(".")
-        if rest:
-            set_value(subconf.setdefault(root, {}), rest, val)
+    handle_value = config._handle_value
+    for key, val in overrides.items():
+        *sections, name = key.split(".")
+        subconf = config
+        for section in sections:
+            subconf = subconf.setdefault(section, {})
+        val, _ = handle_value(val)
+        if isinstance(val, str):
+            subconf[name] = FromCommandLine(val)
         else:
-            val, comment = config._handle_value(val)
-            if isinstance(val, str):
-                subconf[root] = FromCommandLine(val)
-            else:
-                subconf[root] = val
-
-    for key, val in vars(args).items():
-        if val is not None:
-            set_value(config, key, val)
+            subconf[name] = val
 
 
 def _print_parser_error(parser, error):
@@ -310,8 +393,6 @@ def _determine_log_configuration(known):
     ):
         cfgfile = None
     elif known.logcfg:
-        if not os.path.exists(known.logcfg):
-            raise OSError(f"Logging config {known.logcfg!r} not found")
         cfgfile = known.logcfg
     else:
         cfgfile = _log._find_logging_config_file()
@@ -331,6 +412,12 @@ def _determine_log_configuration(known):
             log_file=known.log_file,
             log_stream=known.log_stream,
         )
+    except OSError as e:
+        # Only report a missing file as not found; other read failures
+        # (permissions, directories, ...) are parsing errors below
+        if cfgfile is not None and not os.path.exists(cfgfile):
+            raise OSError(f"Logging config {cfgfile!r} not found") from e
+        raise ValueError(f"Error parsing logging configuration:\n{e}") from e
     except Exception as e:
         raise ValueError(f"Error parsing logging configuration:\n{e}") from e
     return log_cfg
@@ -371,45 +458,38 @@ def _build_step_from_args(step_class, config, name, config_file, parser, known,
     # Determine whether CRDS should be queried for step parameters
     disable_crds_steppars = get_disable_crds_steppars(known.disable_crds_steppars)
 
-    # This creates a config object from the spec file of the step class merged with
-    # the spec files of the superclasses of the step class and adds arguments for
-    # all of the expected reference files
-
-    # load_spec_file is a method of both Step and Pipeline
-    spec = step_class.load_spec_file()
-
-    step_arg_parser = _build_arg_parser_from_spec(spec, step_class, parent=parser)
+    step_arg_parser = _get_step_arg_parser(step_class, parser)
 
     args = step_arg_parser.parse_args(args)
 
-    del args.cfg_file_or_class
-    del args.debug
-    del args.save_parameters
-    del args.disable_crds_steppars
-    del args.logcfg
-    del args.verbose
-    del args.log_level
-    del args.log_file
-    del args.log_stream
-    positional = args.args
-    del args.args
+    # Drop the arguments that are handled here rather than passed to the step
+    parsed = vars(args)
+    for key in _PARENT_ARGUMENTS:
+        del parsed[key]
+    positional = parsed.pop("args")
 
     # This updates config (a ConfigObj) with the values from the command line arguments
     # Config is empty if class specified, otherwise contains values from config file
-    # specified on command line
-    _override_config_from_args(config, args)
+    # specified on command line. Only the handful of arguments actually given
+    # are passed on, the rest (one per spec parameter) are None.
+    overrides = {key: val for key, val in vars(args).items() if val is not None}
+    _override_config_from_args(config, overrides)
 
     config = step_class.merge_config(config, config_file)
 
-    if len(positional):
+    if not len(positional):
+        logger.info("No input file specified, unable to retrieve parameters from CRDS")
+    elif disable_crds_steppars:
+        logger.debug("CRDS parameter reference retrieval disabled.")
+    else:
         input_file = positional[0]
         if args.input_dir:
-            input_file = args.input_dir + "/" + input_file
+            input_file = os.path.join(args.input_dir, input_file)
 
         # Attempt to retrieve Step parameters from CRDS
         try:
             parameter_cfg = step_class.get_config_from_reference(
-                input_file, disable=disable_crds_steppars
+                input_file, disable=False
             )
         except (FileNotFoundError, OSError):
             logger.warning("Unable to open input file, cannot get parameters from CRDS")
@@ -417,8 +497,6 @@ def _build_step_from_args(step_class, config, name, config_file, parser, known,
             if config:
                 config_parser.merge_config(parameter_cfg, config)
             config = parameter_cfg
-    else:
-        logger.info("No input file specified, unable to retrieve parameters from CRDS")
 
     # This is where the step is instantiated
     try:
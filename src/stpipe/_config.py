@@ -178,7 +178,7 @@ class StepConfig:
         return _inner(parameters, name)
 
 
-def export_config(step):
+def export_config(step, parameters=None):
     """
     Export a step's current parameters to a StepConfig object.
 
@@ -186,6 +186,9 @@ def export_config(step):
     ----------
     step : stpipe.Step
 
+    parameters : dict, optional
+        The result of ``step.get_pars()``, if already available.
+
     Returns
     -------
     stpipe.config.StepConfig
@@ -193,14 +196,16 @@ def export_config(step):
     class_name = get_fully_qualified_class_name(step)
     name = step.name
 
-    parameters = step.get_pars()
+    if parameters is None:
+        parameters = step.get_pars()
     # The Pipeline class includes step parameters, but we're
     # going to collect those ourselves so we can also get
-    # ahold of the name and class name.
-    parameters.pop("steps", None)
+    # ahold of the name and class name. Pass them along so each
+    # step's parameters are only retrieved once.
+    steps_parameters = parameters.pop("steps", None) or {}
 
     steps = [
-        export_config(getattr(step, step_name))
+        export_config(getattr(step, step_name), steps_parameters.get(step_name))
         for step_name, _ in getattr(step, "step_defs", {}).items()
     ]
 
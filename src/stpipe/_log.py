@@ -2,7 +2,6 @@
 Logging setup etc.
 """
 
-import io
 import logging
 import os
 import pathlib
@@ -282,7 +281,9 @@ def load_configuration(
         spec = config_parser.load_spec_file(LogConfig)
         if isinstance(config_file, pathlib.Path):
             config_file = str(config_file)
-        config = ConfigObj(config_file, raise_errors=True, interpolation=False)
+        config = ConfigObj(
+            config_file, raise_errors=True, interpolation=False, file_error=True
+        )
         val = validate.Validator()
         val.functions["level"] = _level_check
         config_parser.validate(config, spec, validator=val)
@@ -315,6 +316,11 @@ def load_configuration(
 
 
 def _find_logging_config_file():
+    """
+    Return the path of the first deprecated logging configuration file
+    found, or None to use the default configuration (equivalent to
+    `DEFAULT_CONFIGURATION`) without parsing it.
+    """
     files = ["stpipe-log.cfg", "~/.stpipe-log.cfg", "/etc/stpipe-log.cfg"]
 
     for file in files:
@@ -328,7 +334,7 @@ def _find_logging_config_file():
             warnings.warn(msg, DeprecationWarning, stacklevel=2)
             return os.path.abspath(file)
 
-    return io.BytesIO(DEFAULT_CONFIGURATION)
+    return None
 
 
 class RecordingHandler(logging.Handler):
@@ -7,6 +7,8 @@ import os
 import os.path
 import textwrap
 import warnings
+import weakref
+from functools import lru_cache
 from inspect import isclass
 
 from asdf import ValidationError as AsdfValidationError
@@ -29,6 +31,11 @@ from .utilities import _not_set
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.NullHandler())
 
+# Specs defined by each class, keyed by class, see `_get_class_spec`.
+# Entries are never invalidated: changing a class's ``spec`` after its
+# first use has no effect until `_clear_class_spec_cache` is called.
+_CLASS_SPEC_CACHE = weakref.WeakKeyDictionary()
+
 
 def _get_input_file_check(root_dir):
     from . import _cmdline
@@ -98,12 +105,39 @@ def _is_string_or_datamodel(value):
     raise VdtTypeError(value)
 
 
+@lru_cache
+def _get_validator(root_dir):
+    """
+    Return the default validator for file-based parameters relative
+    to ``root_dir``.
+
+    Validators cache the parsed form of each spec check, so reusing
+    them avoids re-parsing the same specs for every validation.
+    """
+    validator = Validator()
+    validator.functions["input_file"] = _get_input_file_check(root_dir)
+    validator.functions["output_file"] = _get_output_file_check(root_dir)
+    validator.functions["is_datamodel"] = _is_datamodel
+    validator.functions["is_string_or_datamodel"] = _is_string_or_datamodel
+    return validator
+
+
 def load_config_file(config_file):
     """
     Read the file `config_file` and return the parsed configuration.
     """
     if not os.path.isfile(config_file):
         raise ValueError(f"Config file {config_file} not found.")
+    return _read_config_file(config_file)
+
+
+def _read_config_file(config_file):
+    """
+    Parse `config_file` without first checking that it exists.
+
+    Raises `OSError` (typically `FileNotFoundError` or
+    `IsADirectoryError`) if the file cannot be opened.
+    """
     try:
         with asdf_open(config_file) as asdf_file:
             return _config_obj_from_asdf(asdf_file)
@@ -146,6 +180,9 @@ def get_merged_spec_file(cls, preserve_comments=_not_set):
         effect on the returned spec.
         When True, preserve the comments in the spec file
     """
+    if preserve_comments is not _not_set:
+        msg = "preserve_comments is deprecated"
+        warnings.warn(msg, DeprecationWarning, stacklevel=2)
     if not isclass(cls):
         cls = cls.__class__
     subclasses = cls.mro()
@@ -154,17 +191,36 @@ def get_merged_spec_file(cls, preserve_comments=_not_set):
     config = ConfigObj()
     cfg = None
     for subclass in subclasses:
-        cfg = load_spec_file(subclass, preserve_comments=preserve_comments)
+        cfg = _get_class_spec(subclass)
         if cfg:
             merge_config(config, cfg)
 
     if cfg is not None:
-        config.initial_comment = cfg.initial_comment
-        config.final_comment = cfg.final_comment
+        config.initial_comment = list(cfg.initial_comment)
+        config.final_comment = list(cfg.final_comment)
 
     return config
 
 
+def _get_class_spec(cls):
+    """
+    Return the spec defined by ``cls`` itself (see `load_spec_file`),
+    parsing it only on the first request for that class.
+
+    The returned spec is shared and must not be modified.
+    """
+    try:
+        return _CLASS_SPEC_CACHE[cls]
+    except KeyError:
+        spec = _CLASS_SPEC_CACHE[cls] = load_spec_file(cls)
+        return spec
+
+
+def _clear_class_spec_cache():
+    """Forget the specs cached by `_get_class_spec`."""
+    _CLASS_SPEC_CACHE.clear()
+
+
 def load_spec_file(cls, preserve_comments=_not_set):
     """
     Load the spec file corresponding to the given class.
@@ -256,7 +312,9 @@ def merge_config(into, new):
             # from being converted.
             into.__setitem__(key, val, unrepr=not isinstance(val, dict))
             into.inline_comments[key] = inline_comments.get(key)
-            into.comments[key] = comments.get(key)
+            # Copy the comment lines so the source (possibly a cached
+            # spec) is not modified through the merged config
+            into.comments[key] = list(comments.get(key) or [])
 
 
 def config_from_dict(d, spec=None, root_dir=None, allow_missing=False):
@@ -325,11 +383,7 @@ def validate(
         return config
 
     if validator is None:
-        validator = Validator()
-        validator.functions["input_file"] = _get_input_file_check(root_dir)
-        validator.functions["output_file"] = _get_output_file_check(root_dir)
-        validator.functions["is_datamodel"] = _is_datamodel
-        validator.functions["is_string_or_datamodel"] = _is_string_or_datamodel
+        validator = _get_validator(root_dir or "")
 
     orig_configspec = config.main.configspec
     config.main.configspec = spec
@@ -98,6 +98,7 @@ class Pipeline(Step):
     @classmethod
     def merge_config(cls, config, config_file):
         steps = config.get("steps", {})
+        config_dir = dirname(config_file or "")
 
         # Configure all of the steps
         for key in cls.step_defs:
@@ -107,7 +108,7 @@ class Pipeline(Step):
                 # then override them with our values.
                 if cfg.get("config_file"):
                     cfg2 = config_parser.load_config_file(
-                        join(dirname(config_file or ""), cfg.get("config_file"))
+                        join(config_dir, cfg.get("config_file"))
                     )
                     del cfg["config_file"]
                     config_parser.merge_config(cfg2, cfg)
@@ -125,7 +126,7 @@ class Pipeline(Step):
         for key, val in cls.step_defs.items():
             if not issubclass(val, Step):
                 raise TypeError(f"Entry {key!r} in step_defs is not a Step subclass")
-            stepspec = val.load_spec_file(preserve_comments=preserve_comments)
+            stepspec = val._get_spec()
             steps[key] = Section(steps, steps.depth + 1, steps.main, name=key)
 
             config_parser.merge_config(steps[key], stepspec)
@@ -148,7 +149,6 @@ class Pipeline(Step):
     @classmethod
     def _get_config_from_parameters(cls, crds_parameters, crds_observatory):
         refcfg = cls._empty_config()
-        refcfg["steps"] = Section(refcfg, refcfg.depth + 1, refcfg.main, name="steps")
 
         # first apply step configs, then pipeline
         for cal_step in cls.step_defs.keys():
@@ -217,13 +217,14 @@ class Pipeline(Step):
             logger.info("First argument %s does not appear to be a model", input_file)
             return
 
-        ovr_refs = {
-            reftype: self.get_ref_override(reftype)
-            for reftype in self.reference_file_types
-            if self.get_ref_override(reftype) is not None
-        }
+        reference_file_types = self.reference_file_types
+        ovr_refs = {}
+        for reftype in reference_file_types:
+            override = self.get_ref_override(reftype)
+            if override is not None:
+                ovr_refs[reftype] = override
 
-        fetch_types = sorted(set(self.reference_file_types) - set(ovr_refs.keys()))
+        fetch_types = sorted(set(reference_file_types) - ovr_refs.keys())
 
         logger.info(
             "Prefetching reference files for dataset: %r reftypes = %r",
@@ -268,3 +269,6 @@ class Pipeline(Step):
                 full_spec=full_spec
             )
         return pars
+
+    def _get_par_names(self):
+        return super()._get_par_names() | {"steps"}
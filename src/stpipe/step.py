@@ -2,11 +2,13 @@
 Step
 """
 
+import contextvars
 import gc
 import logging
 import os
 import sys
 import warnings
+import weakref
 from collections.abc import Sequence
 from contextlib import contextmanager, nullcontext, suppress
 from functools import partial
@@ -33,6 +35,30 @@ from .utilities import _not_set
 
 logger = logging.getLogger(__name__)
 
+# Step results that are saved with Step.save_model
+_MODEL_TYPES = (AbstractDataModel, AbstractModelLibrary)
+
+# Parameter reference files found in CRDS, by reftype, during one
+# call to Step.get_config_from_reference
+_config_ref_files = contextvars.ContextVar("_config_ref_files", default=None)
+
+
+class _ParsDumper(getattr(yaml, "CDumper", yaml.Dumper)):
+    """
+    YAML dumper used to log Step parameters, writing booleans and
+    None as their Python literals.
+    """
+
+
+_ParsDumper.add_representer(
+    bool,
+    lambda dumper, value: dumper.represent_scalar("tag:yaml.org,2002:bool", str(value)),
+)
+_ParsDumper.add_representer(
+    type(None),
+    lambda dumper, value: dumper.represent_scalar("tag:yaml.org,2002:str", "None"),
+)
+
 
 class Step:
     """
@@ -71,10 +97,19 @@ class Step:
     # but by default attempt to prefetch
     prefetch_references = True
 
+    # A full garbage collection is run before each top-level run. Set to
+    # True in subclasses to also collect before runs within a pipeline.
+    collect_before_run = False
+
     # This needs to be set to a logging formatter for any
     # log_records to be saved.
     _log_records_formatter = None
 
+    # Merged configspecs keyed by Step class, see `_get_spec`. Entries
+    # are never invalidated: changing ``spec``, ``reference_file_types``
+    # or ``step_defs`` after first use requires `_clear_spec_cache`.
+    _spec_cache: ClassVar = weakref.WeakKeyDictionary()
+
     @classmethod
     def get_config_reftype(cls):
         """
@@ -104,6 +139,27 @@ class Step:
             )
         return spec
 
+    @classmethod
+    def _get_spec(cls):
+        """
+        Return the configspec from `load_spec_file`, loading it only on
+        the first request for this class.
+
+        The returned spec is shared by all callers and must not be
+        modified. Use `load_spec_file` to get a spec that can be.
+        """
+        try:
+            return Step._spec_cache[cls]
+        except KeyError:
+            spec = Step._spec_cache[cls] = cls.load_spec_file()
+            return spec
+
+    @staticmethod
+    def _clear_spec_cache():
+        """Forget the configspecs cached by `_get_spec` for all classes."""
+        Step._spec_cache.clear()
+        config_parser._clear_class_spec_cache()
+
     @classmethod
     def print_configspec(cls):
         specfile = cls.load_spec_file()
@@ -215,10 +271,8 @@ class Step:
                 else:
                     name = step_class.__name__
 
-        if "name" in config:
-            del config["name"]
-        if "class" in config:
-            del config["class"]
+        config.pop("name", None)
+        config.pop("class", None)
 
         return step_class, name
 
@@ -258,38 +312,28 @@ class Step:
             Any parameters found in the config file fragment will be
             set as member variables on the returned `Step` instance.
         """
+        config_name = config.pop("name", None)
         if not name:
-            if config.get("name"):
-                name = config["name"]
-            else:
-                name = cls.__name__
+            name = config_name or cls.__name__
 
-        if "name" in config:
-            del config["name"]
-        if "class" in config:
-            del config["class"]
-        if "config_file" in config:
-            del config["config_file"]
+        config.pop("class", None)
+        config.pop("config_file", None)
 
-        spec = cls.load_spec_file()
+        spec = cls._get_spec()
         config = cls.merge_config(config, config_file)
         config_parser.validate(config, spec, root_dir=dirname(config_file or ""))
 
-        if "config_file" in config:
-            del config["config_file"]
-        if "name" in config:
-            del config["name"]
+        config.pop("config_file", None)
+        config.pop("name", None)
 
         # cmdline.FromCommandLine instances should not be passed to
         # steps. Instead, convert them back to strings.
         from . import _cmdline
 
-        kwargs = {}
-        for k in config:
-            if isinstance(config[k], _cmdline.FromCommandLine):
-                kwargs[k] = str(config[k])
-            else:
-                kwargs[k] = config[k]
+        kwargs = dict(config.items())
+        for k, v in kwargs.items():
+            if isinstance(v, _cmdline.FromCommandLine):
+                kwargs[k] = str(v)
 
         return cls(
             name=name,
@@ -314,24 +358,26 @@ class Step:
         filename : str or None
             Filename as a string or None if no filename could be determined.
         """
-        if isinstance(dataset, str):
-            dataset = Path(dataset)
-
-        if isinstance(dataset, Path):
-            return dataset.name
-
-        if isinstance(dataset, Sequence):
-            if not len(dataset):
+        # Unwrap models and libraries in place until a filename
+        # (or nothing usable) is found
+        while True:
+            if isinstance(dataset, str):
+                dataset = Path(dataset)
+
+            if isinstance(dataset, Path):
+                return dataset.name
+
+            if isinstance(dataset, Sequence):
+                if not len(dataset):
+                    return None
+                dataset = dataset[0]
+
+            if isinstance(dataset, AbstractDataModel):
+                dataset = dataset.meta.filename
+            elif isinstance(dataset, AbstractModelLibrary):
+                dataset = dataset.asn.get("table_name", None)
+            else:
                 return None
-            dataset = dataset[0]
-
-        if isinstance(dataset, AbstractDataModel):
-            return cls._get_filename(dataset.meta.filename)
-
-        if isinstance(dataset, AbstractModelLibrary):
-            return cls._get_filename(dataset.asn.get("table_name", None))
-
-        return None
 
     @classmethod
     def _get_crds_parameters(cls, dataset):
@@ -408,7 +454,9 @@ class Step:
             Additional parameters to set.  These will be set as member
             variables on the new Step instance.
         """
-        self._reference_files_used = []
+        # Reference file URI used during the most recent call to
+        # Step.run, by reference type.
+        self._reference_files_used = {}
         # A list of logging.LogRecord emitted to the stpipe root logger
         # during the most recent call to Step.run.
         self._log_records = []
@@ -416,7 +464,7 @@ class Step:
         self._input_dir = None
         self._keywords = kws
         if _validate_kwds:
-            spec = self.load_spec_file()
+            spec = self._get_spec()
             kws = config_parser.config_from_dict(
                 kws,
                 spec,
@@ -436,10 +484,6 @@ class Step:
         for key, val in kws.items():
             setattr(self, key, val)
 
-        # For transition purposes, create and store a logger
-        # for this step.  If used, it will raise a DeprecationWarning.
-        self._log = logging.getLogger(self.qualified_name)
-
         # Log the fact that we have been init-ed.
         logger.info(
             "%s instance created.",
@@ -457,8 +501,7 @@ class Step:
             self._pre_hooks = _hooks.get_hook_objects(self, "pre", self.pre_hooks)
             self._post_hooks = _hooks.get_hook_objects(self, "post", self.post_hooks)
         else:
-            self._pre_hooks = []
-            self._post_hooks = []
+            self._pre_hooks = self._post_hooks = ()
 
     @property
     def log(self):
@@ -468,7 +511,9 @@ class Step:
             "Please use a local logger, retrieved via logging.getLogger."
         )
         warnings.warn(msg, DeprecationWarning, stacklevel=2)
-        return self._log
+        # For transition purposes, return the logger named after
+        # this step.  It is only looked up when actually used.
+        return logging.getLogger(self.qualified_name)
 
     @property
     def log_records(self):
@@ -481,16 +526,30 @@ class Step:
         """
         return self._log_records
 
+    @property
+    def reference_files_used(self):
+        """
+        Retrieve the reference files used by the current or most recent run.
+
+        Returns
+        -------
+        list of tuple
+            Each a tuple in the form (str reference type, str reference URI).
+        """
+        return list(self._reference_files_used.items())
+
     def run(self, *args):
         """
         Run handles the generic setup and teardown that happens with
         the running of each step.  The real work that is unique to
         each step type is done in the `process` method.
         """
-        gc.collect()
+        if self.parent is None or self.collect_before_run:
+            gc.collect()
 
         # if run is called directly attach handlers to record logs
-        if _log.LogConfig.applied is None:
+        applied_log_cfg = _log.LogConfig.applied
+        if applied_log_cfg is None:
             ctx = _log.LogConfig(
                 [],
                 level=logging.NOTSET,
@@ -504,7 +563,7 @@ class Step:
                 ],
             )
         else:
-            ctx = nullcontext(_log.LogConfig.applied.log_records)
+            ctx = nullcontext(applied_log_cfg.log_records)
         with ctx as log_records:
             self._log_records = log_records
 
@@ -512,19 +571,15 @@ class Step:
 
             logger.info("Step %s running with args %s.", self.name, args)
             # log Step or Pipeline parameters from top level only
-            if self.parent is None:
+            if self.parent is None and logger.isEnabledFor(logging.INFO):
                 logger.info(
                     "Step %s parameters are:%s",
                     self.name,
                     # Add an indent to each line of the YAML output
                     "\n  "
                     + "\n  ".join(
-                        yaml.dump(self.get_pars(), sort_keys=False)
+                        yaml.dump(self.get_pars(), Dumper=_ParsDumper, sort_keys=False)
                         .strip()
-                        # Convert serialized YAML types true/false/null to Python types
-                        .replace(" false", " False")
-                        .replace(" true", " True")
-                        .replace(" null", " None")
                         .splitlines()
                     ),
                 )
@@ -543,14 +598,15 @@ class Step:
             if self.suffix is None:
                 self.suffix = self.default_suffix()
 
-            hook_args = args
-            for pre_hook in self._pre_hooks:
-                hook_results = pre_hook.run(*hook_args)
-                if hook_results is not None:
-                    hook_args = (hook_results,)
-            args = hook_args
+            if self._pre_hooks:
+                hook_args = args
+                for pre_hook in self._pre_hooks:
+                    hook_results = pre_hook.run(*hook_args)
+                    if hook_results is not None:
+                        hook_args = (hook_results,)
+                args = hook_args
 
-            self._reference_files_used = []
+            self._reference_files_used = {}
 
             if self.parent is None:
                 if self.skip:
@@ -591,56 +647,53 @@ class Step:
                     step_result = hook_results
 
             # Update meta information
+            # The finalize_result hook allows subclasses to add
+            # metadata (like the cal code package version) before
+            # the result is saved.
+            reference_files_used = self.reference_files_used
             if isinstance(step_result, AbstractModelLibrary):
-                step_result.finalize_result(self, self._reference_files_used)
+                step_result.finalize_result(self, reference_files_used)
+            elif isinstance(step_result, Sequence):
+                for result in step_result:
+                    self.finalize_result(result, reference_files_used)
             else:
-                if not isinstance(step_result, Sequence):
-                    results = [step_result]
-                else:
-                    results = step_result
-
-                # The finalize_result hook allows subclasses to add
-                # metadata (like the cal code package version) before
-                # the result is saved.
-                for result in results:
-                    self.finalize_result(result, self._reference_files_used)
+                self.finalize_result(step_result, reference_files_used)
 
-            self._reference_files_used = []
+            self._reference_files_used = {}
 
             # Save the output file if one was specified
             if not self.skip and self.save_results:
-                # Setup the save list.
                 if not isinstance(step_result, list | tuple):
-                    results_to_save = [step_result]
+                    self._save_result(step_result, None)
                 else:
-                    results_to_save = step_result
-
-                for idx, result in enumerate(results_to_save):
-                    if len(results_to_save) <= 1:
-                        idx = None
-                    if isinstance(result, (AbstractDataModel | AbstractModelLibrary)):
-                        self.save_model(result, idx=idx)
-                    elif hasattr(result, "save"):
-                        try:
-                            output_path = self.make_output_path(idx=idx)
-                        except AttributeError:
-                            logger.warning(
-                                "`save_results` has been requested, but cannot"
-                                " determine filename."
-                            )
-                            logger.warning(
-                                "Specify an output file with `--output_file` or set"
-                                " `--save_results=false`"
-                            )
-                        else:
-                            logger.info("Saving file %s", output_path)
-                            result.save(output_path, overwrite=True)
+                    use_index = len(step_result) > 1
+                    for idx, result in enumerate(step_result):
+                        self._save_result(result, idx if use_index else None)
 
             if not self.skip:
                 logger.info("Step %s done", self.name)
 
         return step_result
 
+    def _save_result(self, result, idx):
+        """Save one result of ``run``, if it can be saved"""
+        if isinstance(result, _MODEL_TYPES):
+            self.save_model(result, idx=idx)
+        elif hasattr(result, "save"):
+            try:
+                output_path = self.make_output_path(idx=idx)
+            except AttributeError:
+                logger.warning(
+                    "`save_results` has been requested, but cannot determine filename."
+                )
+                logger.warning(
+                    "Specify an output file with `--output_file` or set"
+                    " `--save_results=false`"
+                )
+            else:
+                logger.info("Saving file %s", output_path)
+                result.save(output_path, overwrite=True)
+
     def finalize_result(self, result, reference_files_used):
         """
         Hook that allows subclasses to set mission-specific metadata on each
@@ -655,6 +708,8 @@ class Step:
         reference_files_used : list of tuple
             List of reference files used when running the step, each
             a tuple in the form (str reference type, str reference URI).
+            Each reference type appears once, with the most recently
+            retrieved reference.
         """
 
     @staticmethod
@@ -818,23 +873,24 @@ class Step:
             Attribute value or default if not found
         """
         if parent_first:
-            try:
-                value = self.parent.search_attr(attribute, parent_first=parent_first)
-            except AttributeError:
-                value = None
-            if value is None:
-                value = getattr(self, attribute, default)
-            return value
-
-        value = getattr(self, attribute, None)
-        if value is None:
-            try:
-                value = self.parent.search_attr(attribute)
-            except AttributeError:
-                pass
-        if value is None:
-            value = default
-        return value
+            parents = []
+            step = getattr(self, "parent", None)
+            while step is not None:
+                parents.append(step)
+                step = getattr(step, "parent", None)
+            for step in reversed(parents):
+                value = getattr(step, attribute, None)
+                if value is not None:
+                    return value
+            return getattr(self, attribute, default)
+
+        step = self
+        while step is not None:
+            value = getattr(step, attribute, None)
+            if value is not None:
+                return value
+            step = getattr(step, "parent", None)
+        return default
 
     def _precache_references(self, input_file):
         """Because Step precaching precedes calls to get_reference_file() almost
@@ -859,7 +915,9 @@ class Step:
 
         return abspath(path) if path and path != "N/A" else path
 
-    def get_reference_file(self, input_file, reference_file_type):
+    def get_reference_file(
+        self, input_file, reference_file_type, crds_observatory=None
+    ):
         """
         Get a reference file from CRDS.
 
@@ -869,15 +927,21 @@ class Step:
 
         Parameters
         ----------
-        input_file : a datamodel that is an instance of AbstractDataModel
+        input_file : a datamodel that is an instance of AbstractDataModel or dict
             A model of the input file.  Metadata on this input file
             will be used by the CRDS "bestref" algorithm to obtain a
-            reference file.
+            reference file. If a dict, it is used as the CRDS parameters
+            without opening a model and crds_observatory must be a
+            non-None value.
 
         reference_file_type : string
             The type of reference file to retrieve.  For example, to
             retrieve a flat field reference file, this would be 'flat'.
 
+        crds_observatory : str
+            Observatory name ('jwst' or 'roman'). Only used when
+            ``input_file`` is a dict.
+
         Returns
         -------
         reference_file : path of reference file,  a string
@@ -887,8 +951,8 @@ class Step:
             # Store a representative string for datamodels, then
             # return the model without checking it.
             if isinstance(override, AbstractDataModel):
-                self._reference_files_used.append(
-                    (reference_file_type, override.override_handle)
+                self._reference_files_used[reference_file_type] = (
+                    override.override_handle
                 )
                 return override
 
@@ -900,15 +964,19 @@ class Step:
             # check that it is a valid reference.
             if override.strip() == "N/A":
                 # Special value: store it as is.
-                self._reference_files_used.append((reference_file_type, "N/A"))
+                self._reference_files_used[reference_file_type] = "N/A"
             else:
                 # Record the full path to the override file.
-                self._reference_files_used.append(
-                    (reference_file_type, abspath(override))
-                )
+                self._reference_files_used[reference_file_type] = abspath(override)
             reference_name = override
         else:
-            parameters, observatory = self._get_crds_parameters(input_file)
+            if isinstance(input_file, dict):
+                # crds_parameters were already collected by the caller
+                if crds_observatory is None:
+                    raise ValueError("Need a valid name for crds_observatory.")
+                parameters, observatory = input_file, crds_observatory
+            else:
+                parameters, observatory = self._get_crds_parameters(input_file)
             reference_name = crds_client.get_reference_file(
                 parameters,
                 reference_file_type,
@@ -918,7 +986,7 @@ class Step:
                 hdr_name = "crds://" + basename(reference_name)
             else:
                 hdr_name = "N/A"
-            self._reference_files_used.append((reference_file_type, hdr_name))
+            self._reference_files_used[reference_file_type] = hdr_name
         return crds_client.check_reference_open(reference_name)
 
     @classmethod
@@ -928,19 +996,24 @@ class Step:
     @classmethod
     def _get_config_from_parameters(cls, crds_parameters, crds_observatory):
         reftype = cls.get_config_reftype()
-        refcfg = config_parser.ConfigObj()
-        try:
-            ref_file = crds_client.get_reference_file(
-                crds_parameters,
-                reftype,
-                crds_observatory,
-            )
-        except (AttributeError, crds_client.CrdsError):
-            logger.debug("%s: No parameters found", reftype.upper())
-            return refcfg
+        ref_files = _config_ref_files.get()
+        if ref_files is not None and reftype in ref_files:
+            ref_file = ref_files[reftype]
+        else:
+            try:
+                ref_file = crds_client.get_reference_file(
+                    crds_parameters,
+                    reftype,
+                    crds_observatory,
+                )
+            except (AttributeError, crds_client.CrdsError):
+                logger.debug("%s: No parameters found", reftype.upper())
+                return config_parser.ConfigObj()
+            if ref_files is not None:
+                ref_files[reftype] = ref_file
         if ref_file == "N/A":
             logger.debug("No %s reference files found.", reftype.upper())
-            return refcfg
+            return config_parser.ConfigObj()
         logger.info("%s parameters found: %s", reftype.upper(), ref_file)
         return config_parser.load_config_file(ref_file)
 
@@ -969,7 +1042,6 @@ class Step:
             and return an empty config obj.
         """
         reftype = cls.get_config_reftype()
-        refcfg = cls._empty_config()
 
         # Check if retrieval should be attempted.
         if disable is None:
@@ -978,7 +1050,7 @@ class Step:
             logger.debug(
                 "%s: CRDS parameter reference retrieval disabled.", reftype.upper()
             )
-            return refcfg
+            return cls._empty_config()
 
         if isinstance(dataset, dict):
             # crds_parameters was passed as input from pipeline.py
@@ -992,16 +1064,23 @@ class Step:
                 crds_parameters, crds_observatory = cls._get_crds_parameters(dataset)
             except (OSError, TypeError, ValueError):
                 logger.warning("Input dataset is not an instance of AbstractDataModel.")
-                return refcfg
-                disable = True
+                return cls._empty_config()
 
         # Retrieve step parameters from CRDS
         logger.debug("Retrieving step %s parameters from CRDS", reftype.upper())
-        ref = cls._get_config_from_parameters(crds_parameters, crds_observatory)
-        ref_pars = {
-            par: value for par, value in ref.items() if par not in ["class", "name"]
-        }
-        logger.debug("%s parameters retrieved from CRDS: %s", reftype.upper(), ref_pars)
+        # Steps used more than once in a pipeline share a single lookup
+        token = _config_ref_files.set({})
+        try:
+            ref = cls._get_config_from_parameters(crds_parameters, crds_observatory)
+        finally:
+            _config_ref_files.reset(token)
+        if logger.isEnabledFor(logging.DEBUG):
+            ref_pars = {
+                par: value for par, value in ref.items() if par not in ("class", "name")
+            }
+            logger.debug(
+                "%s parameters retrieved from CRDS: %s", reftype.upper(), ref_pars
+            )
         return ref
 
     @staticmethod
@@ -1048,7 +1127,7 @@ class Step:
         """
         self._set_input_dir(obj, exclusive=exclusive)
 
-        err_message = f"Cannot set master input file name from object {obj}"
+        err_message = "Cannot set master input file name from object %s"
         parent_input_filename = self.search_attr("_input_filename")
         if not exclusive or parent_input_filename is None:
             if isinstance(obj, str | Path):
@@ -1057,9 +1136,9 @@ class Step:
                 try:
                     self._input_filename = obj.meta.filename
                 except AttributeError:
-                    logger.debug(err_message)
+                    logger.debug(err_message, obj)
             else:
-                logger.debug(err_message)
+                logger.debug(err_message, obj)
 
     def save_model(
         self,
@@ -1219,17 +1298,11 @@ class Step:
         # Suffix check. An explicit check on `False` is necessary
         # because `None` is also allowed.
         suffix = _get_suffix(suffix, step=step)
-        if suffix is not False:
-            default_name_format = "{basename}{components}{suffix_sep}{suffix}.{ext}"
-            suffix_sep = None
-            if suffix is not None:
-                basename, suffix_sep = step.remove_suffix(basename)
-            if suffix_sep is None:
-                suffix_sep = separator
-        else:
-            default_name_format = "{basename}{components}.{ext}"
-            suffix = None
-            suffix_sep = None
+        suffix_sep = None
+        if suffix is not False and suffix is not None:
+            basename, suffix_sep = step.remove_suffix(basename)
+        if suffix_sep is None:
+            suffix_sep = separator
 
         if len(components):
             component_str = separator.join(
@@ -1238,17 +1311,15 @@ class Step:
         else:
             component_str = ""
 
-        basename = default_name_format.format(
-            basename=basename,
-            suffix=suffix,
-            suffix_sep=suffix_sep,
-            ext=ext,
-            components=component_str,
-        )
+        if suffix is not False:
+            basename = f"{basename}{component_str}{suffix_sep}{suffix}.{ext}"
+        else:
+            basename = f"{basename}{component_str}.{ext}"
 
         output_dir = step.search_attr("output_dir", default="")
-        output_dir = expandvars(expanduser(output_dir))
-        return join(output_dir, basename)
+        if not output_dir:
+            return basename
+        return join(expandvars(expanduser(output_dir)), basename)
 
     @classmethod
     def _datamodels_open(cls, init, **kwargs):
@@ -1301,13 +1372,10 @@ class Step:
             File path using ``input_dir`` if the input
             had no directory path.
         """
-        full_path = file_path
-        if isinstance(file_path, str):
-            original_path, file_name = split(file_path)
-            if not len(original_path):
-                full_path = join(self.input_dir, file_name)
+        if isinstance(file_path, str) and not dirname(file_path):
+            return join(self.input_dir, file_path)
 
-        return full_path
+        return file_path
 
     def _set_input_dir(self, input_, exclusive=True):
         """Set the input directory
@@ -1361,14 +1429,22 @@ class Step:
         pars = config_parser.config_from_dict(instance_pars, spec, allow_missing=True)
 
         # Convert the config to a pure dict.
-        pars_dict = {}
-        for key, value in pars.items():
+        pars_dict = dict(pars.items())
+        for key, value in pars_dict.items():
             if isinstance(value, _cmdline.FromCommandLine):
                 pars_dict[key] = str(value)
-            else:
-                pars_dict[key] = value
         return pars_dict
 
+    def _get_par_names(self):
+        """Return the names of the parameters reported by `get_pars`
+
+        The names come from the spec alone, without retrieving
+        and validating the parameter values. Subclasses that override
+        `get_pars` to report parameters not in the spec must override
+        this method as well.
+        """
+        return set(config_parser.get_merged_spec_file(self))
+
     def export_config(self, filename, include_metadata=False):
         """
         Export this step's parameters to an ASDF config file.
@@ -1405,8 +1481,13 @@ class Step:
         special in that it is a dict whose keys are the steps assigned
         directly as parameters to the current step. This is standard
         practice for `Pipeline`-based steps.
+
+        The parameters that can be updated are those named in the spec
+        (see ``_get_par_names``), not the keys returned by `get_pars`.
+        Extra parameters reported by an overridden `get_pars` are
+        ignored unless ``_get_par_names`` is overridden to match.
         """
-        existing = self.get_pars().keys()
+        existing = self._get_par_names()
         for parameter, value in parameters.items():
             if parameter in existing:
                 if parameter != "steps":
@@ -1533,6 +1614,10 @@ def _get_suffix(suffix, step=None, default_suffix=None):
     return suffix
 
 
+# Strings accepted as true by get_disable_crds_steppars
+_TRUTHS = frozenset(("true", "True", "t", "yes", "y"))
+
+
 def get_disable_crds_steppars(default=None):
     """Return either the explicit default flag or retrieve from the environment
 
@@ -1549,18 +1634,17 @@ def get_disable_crds_steppars(default=None):
     flag: bool
         True to disable CRDS STEPPARS retrieval.
     """
-    truths = ("true", "True", "t", "yes", "y")
     if default:
         if isinstance(default, bool):
             return default
 
         if isinstance(default, str):
-            return default in truths
+            return default in _TRUTHS
 
         raise ValueError(f"default must be string or boolean: {default}")
 
     flag = os.environ.get("STPIPE_DISABLE_CRDS_STEPPARS", "")
-    return flag in truths
+    return flag in _TRUTHS
 
 
 @contextmanager
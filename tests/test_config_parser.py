@@ -58,3 +58,43 @@ def test_preserve_comments_deprecation(value):
     assert "initial comment" in spec.initial_comment[0]
     assert "final comment" in spec.final_comment[0]
     assert "inline comment (with parentheses)" in spec.inline_comments["bar"]
+
+
+def test_get_merged_spec_file_fresh():
+    """Each merged spec is a new object, isolated from the spec cache"""
+
+    class Foo:
+        spec = """
+        # initial comment
+        foo = integer(default=1)
+        # bar comment
+        bar = string(default='bam')  # an inline comment
+        # final comment
+        """
+
+    spec = config_parser.get_merged_spec_file(Foo)
+    assert config_parser.get_merged_spec_file(Foo) is not spec
+    bar_comments = list(spec.comments["bar"])
+    assert "bar comment" in bar_comments[0]
+
+    spec["bar"] = "string(default='baz')"
+    spec["new"] = "integer(default=1)"
+    spec.inline_comments["bar"] = "# changed"
+    spec.comments["bar"].append("# appended")
+    spec.initial_comment.append("# appended")
+    spec.final_comment.append("# appended")
+
+    spec = config_parser.get_merged_spec_file(Foo)
+    assert spec["bar"] == "string(default='bam')"
+    assert "new" not in spec
+    assert "an inline comment" in spec.inline_comments["bar"]
+    assert spec.comments["bar"] == bar_comments
+    assert len(spec.initial_comment) == 1
+    assert len(spec.final_comment) == 1
+
+
+def test_get_validator_cached(tmp_path):
+    """Validators are reused for a root_dir and distinct between them"""
+    validator = config_parser._get_validator(str(tmp_path))
+    assert config_parser._get_validator(str(tmp_path)) is validator
+    assert config_parser._get_validator(str(tmp_path / "other")) is not validator
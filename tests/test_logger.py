@@ -311,6 +311,34 @@ def test_step_from_cmdline_no_root_logger_changes(log_cfg_path, root_logger_unch
         )
 
 
+def test_step_from_cmdline_missing_logcfg(tmp_path, capsys):
+    missing = str(tmp_path / "missing-log.cfg")
+    with (
+        pytest.warns(DeprecationWarning, match="logcfg configuration file"),
+        pytest.raises(OSError, match="Logging config .* not found"),
+    ):
+        stpipe._cmdline.step_from_cmdline(
+            ["test_logger.LoggingPipeline", "--logcfg", missing]
+        )
+
+
+def test_step_from_cmdline_unreadable_logcfg(tmp_path, monkeypatch):
+    unreadable = tmp_path / "log.cfg"
+    unreadable.touch()
+
+    def raise_permission_error(*args, **kwargs):
+        raise PermissionError(13, "Permission denied")
+
+    monkeypatch.setattr(_log, "ConfigObj", raise_permission_error)
+    with (
+        pytest.warns(DeprecationWarning, match="logcfg configuration file"),
+        pytest.raises(ValueError, match="(?s)Error parsing logging.*Permission denied"),
+    ):
+        stpipe._cmdline.step_from_cmdline(
+            ["test_logger.LoggingPipeline", "--logcfg", str(unreadable)]
+        )
+
+
 @pytest.mark.parametrize("logging_level", LOGLEVELS)
 def test_step_from_cmdline_no_root_logger_changes_level_arg(
     root_logger_unchanged, logging_level
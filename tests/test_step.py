@@ -14,7 +14,7 @@ from crds.core.exceptions import CrdsLookupError
 
 import stpipe.config_parser as cp
 from steps import EmptyPipeline, MakeListPipeline, MakeListStep
-from stpipe import crds_client
+from stpipe import _cmdline, crds_client
 from stpipe._config import StepConfig
 from stpipe.datamodel import AbstractDataModel
 from stpipe.pipeline import Pipeline
@@ -632,6 +632,27 @@ def test_subclass_get_crds_parameters(monkeypatch):
     assert called
 
 
+def test_get_reference_file_dict(monkeypatch):
+    """Test that get_reference_file accepts CRDS parameters as a dict"""
+    step = StepWithGetCRDSParameters()
+    crds_parameters = {"meta.instrument.name": "foo"}
+
+    def get_reference_file(parameters, reference_file_type, observatory):
+        assert parameters is crds_parameters
+        assert observatory == "bar"
+        return "N/A"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("CRDS parameters were computed from the dataset")
+
+    monkeypatch.setattr(crds_client, "get_reference_file", get_reference_file)
+    monkeypatch.setattr(step, "_get_crds_parameters", fail)
+    with pytest.raises(ValueError, match="Need a valid name for crds_observatory"):
+        step.get_reference_file(crds_parameters, "flat")
+    assert step.get_reference_file(crds_parameters, "flat", "bar") == "N/A"
+    assert step._reference_files_used == {"flat": "N/A"}
+
+
 @pytest.mark.parametrize(
     "dataset, filename",
     [
@@ -693,7 +714,7 @@ def test_ref_file_override(klass, tmp_path):
     step.override_dark = override_path
     ref_path = step.get_reference_file("foo.asdf", "dark")
     assert ref_path == str(override_path)
-    assert ("dark", ref_path) in step._reference_files_used
+    assert step._reference_files_used["dark"] == ref_path
 
 
 @pytest.mark.parametrize("klass", (SimpleStep, SimplePipe, PipeWithPipe))
@@ -704,7 +725,7 @@ def test_ref_file_override_na(klass):
     step.override_dark = override_path
     ref_path = step.get_reference_file("foo.asdf", "dark")
     assert ref_path == override_path
-    assert ("dark", ref_path) in step._reference_files_used
+    assert step._reference_files_used["dark"] == ref_path
 
 
 @pytest.mark.parametrize("klass", (SimpleStep, SimplePipe, PipeWithPipe))
@@ -715,7 +736,45 @@ def test_ref_file_override_empty(klass):
     step.override_dark = override_path
     ref_path = step.get_reference_file("foo.asdf", "dark")
     assert ref_path == override_path
-    assert ("dark", ref_path) not in step._reference_files_used
+    assert "dark" not in step._reference_files_used
+
+
+def test_finalize_result_reference_files_used(tmp_path):
+    """Each reference type is passed to finalize_result once, as last retrieved"""
+    first, second = tmp_path / "first.asdf", tmp_path / "second.asdf"
+    first.touch()
+    second.touch()
+    used = []
+
+    class RefStep(SimpleStep):
+        def process(self, *args):
+            for override in (first, "N/A", second):
+                self.override_dark = override
+                self.get_reference_file("foo.asdf", "dark")
+            self.override_flat = "N/A"
+            self.get_reference_file("foo.asdf", "flat")
+            return SimpleDataModel()
+
+        def finalize_result(self, result, reference_files_used):
+            used.extend(reference_files_used)
+
+    RefStep().run()
+    assert used == [("dark", str(second)), ("flat", "N/A")]
+
+
+def test_reference_files_used(tmp_path):
+    """Reference files used are reported as (reftype, uri) pairs"""
+    override_path = tmp_path / "ref.asdf"
+    override_path.touch()
+    step = SimpleStep()
+    step.override_dark = str(override_path)
+    step.override_flat = "N/A"
+    step.get_reference_file("foo.asdf", "dark")
+    step.get_reference_file("foo.asdf", "flat")
+    assert step.reference_files_used == [
+        ("dark", str(override_path)),
+        ("flat", "N/A"),
+    ]
 
 
 def test_get_stpipe_loggers():
@@ -1036,6 +1095,31 @@ def test_getpars(step_obj, full_spec, expected):
     assert step_obj.get_pars(full_spec=full_spec) == expected
 
 
+@pytest.mark.parametrize(
+    "step",
+    [
+        MakeListStep(par1=0.0, par2="from args"),
+        MakeListPipeline(steps={"make_list": {"par1": 0.0, "par2": "from args"}}),
+        EmptyPipeline(),
+        PipeWithPipe(),
+    ],
+)
+def test_update_pars(step):
+    """Only existing parameters, including those of sub-steps, are updated"""
+    assert step._get_par_names() == step.get_pars().keys()
+
+    pars = step.get_pars()
+    pars["not_a_parameter"] = True
+    pars["output_ext"] = "updated"
+    for step_pars in pars.get("steps", {}).values():
+        step_pars["output_ext"] = "sub-updated"
+    step.update_pars(pars)
+    assert step.get_pars() == {
+        key: value for key, value in pars.items() if key != "not_a_parameter"
+    }
+    assert not hasattr(step, "not_a_parameter")
+
+
 def test_merge_pipeline_config_deprecation(tmp_path):
     fn = tmp_path / "other.cfg"
     cfg = ConfigObj()
@@ -1043,3 +1127,221 @@ def test_merge_pipeline_config_deprecation(tmp_path):
         cfg.write(f)
     with pytest.warns(DeprecationWarning, match="merge_pipeline_config is deprecated"):
         SimplePipe.merge_pipeline_config(cfg, str(fn))
+
+
+def test_cmdline_parser_cached():
+    """The argument parser is built once per class across cmdline invocations"""
+    parent = _cmdline._build_parent_arg_parser()
+    parser = _cmdline._get_step_arg_parser(SimpleStep, parent)
+    assert _cmdline._get_step_arg_parser(SimpleStep, parent) is parser
+
+
+def test_cmdline_parser_help_defaults():
+    """Default values are shown intact in the argument help"""
+
+    class DefaultsStep(Step):
+        spec = """
+        animal = string(default=fat)  # An animal
+        nothing = string(default=None)  # Nothing
+        nonesuch = string(default=aNone)  # Not nothing
+        """
+
+    parser = _cmdline._get_step_arg_parser(
+        DefaultsStep, _cmdline._build_parent_arg_parser()
+    )
+    help_text = " ".join(parser.format_help().split())
+    assert "An animal [default=fat]" in help_text
+    assert "Nothing [default" not in help_text
+    assert "Not nothing [default=aNone]" in help_text
+
+
+@pytest.mark.parametrize(
+    "identifier", ["makelist", "makelist.cfg", "steps.yaml", "steps.yml"]
+)
+def test_get_config_and_class_from_file(tmp_cwd, identifier):
+    """Config files are found whether or not they look like a file path"""
+    config_file = Path(__file__).parent / "steps" / "makelist.cfg"
+    (tmp_cwd / identifier).write_text(config_file.read_text())
+
+    step_class, config, name, returned_config_file = _cmdline._get_config_and_class(
+        identifier
+    )
+    assert step_class is MakeListStep
+    assert name == "make_list"
+    assert config["par1"] == "43.0"
+    assert returned_config_file == identifier
+
+
+def test_get_config_and_class_unreadable_file(tmp_cwd, monkeypatch):
+    """Errors other than a missing config file are not hidden"""
+
+    def raise_permission_error(config_file):
+        raise PermissionError(config_file)
+
+    monkeypatch.setattr(cp, "_read_config_file", raise_permission_error)
+    with pytest.raises(PermissionError):
+        _cmdline._get_config_and_class("pars/makelist.cfg")
+
+
+@pytest.mark.parametrize("step_class", [SimpleStep, SimplePipe, PipeWithPipe])
+def test_spec_cached(step_class):
+    """The cached configspec is shared and left unmodified by instantiation"""
+    spec = step_class._get_spec()
+    step_class.from_config_section(ConfigObj(), name="cached")
+    step_class(skip=True)
+    assert step_class._get_spec() is spec
+    assert spec == step_class.load_spec_file()
+    assert step_class.load_spec_file() is not spec
+
+
+def test_clear_spec_cache():
+    """Cached specs and parsers are stale until the caches are cleared"""
+
+    class ChangingStep(Step):
+        spec = """
+        old = string(default=None)
+        """
+
+    parent = _cmdline._build_parent_arg_parser()
+    parser = _cmdline._get_step_arg_parser(ChangingStep, parent)
+    ChangingStep.spec = """
+    new = string(default=None)
+    """
+    assert "old" in ChangingStep._get_spec()
+    assert _cmdline._get_step_arg_parser(ChangingStep, parent) is parser
+
+    _cmdline._clear_parser_cache()
+    assert "new" in ChangingStep._get_spec()
+    assert "old" not in ChangingStep._get_spec()
+    assert "--new" in _cmdline._get_step_arg_parser(ChangingStep, parent).format_help()
+
+
+def test_run_logs_parameters(caplog):
+    """Parameters are logged as YAML with Python literals for booleans and None"""
+    step = SimpleStep(str1="this is false", str2="null")
+    step.process = lambda *args: None
+    with caplog.at_level("INFO", logger="stpipe"):
+        step.run()
+    message = next(
+        r.getMessage() for r in caplog.records if "parameters are" in r.getMessage()
+    )
+    assert "\n  skip: False\n" in message
+    assert "\n  output_use_index: True\n" in message
+    assert "\n  output_file: None\n" in message
+    assert "\n  str1: this is false\n" in message
+    assert "\n  str2: 'null'\n" in message
+
+
+@pytest.mark.parametrize("parent_first, expected", [(False, "step"), (True, "outer")])
+def test_search_attr(parent_first, expected):
+    """Attributes are found along the parent chain in the requested order"""
+    pipe = PipeWithPipe()
+    step = pipe.pipe1.step1
+    step.search_test = "step"
+    pipe.pipe1.search_test = "inner"
+    pipe.search_test = "outer"
+    assert step.search_attr("search_test", parent_first=parent_first) == expected
+
+    step.search_test = None
+    assert step.search_attr("search_test") == "inner"
+    assert step.search_attr("missing", default="default") == "default"
+    assert pipe.search_attr("missing", parent_first=parent_first) is None
+
+
+def test_get_config_from_reference_single_lookup(monkeypatch):
+    """Each parameter reftype is looked up in CRDS once per pipeline"""
+    reftypes = []
+
+    def always_na(parameters, reftype, observatory):
+        reftypes.append(reftype)
+        return "N/A"
+
+    monkeypatch.setattr(crds_client, "get_reference_file", always_na)
+    PipeWithPipe.get_config_from_reference({}, crds_observatory="foo")
+    assert sorted(reftypes) == [
+        "pars-pipewithpipe",
+        "pars-simplepipe",
+        "pars-simplestep",
+    ]
+
+    # lookups are not remembered between calls
+    SimpleStep.get_config_from_reference({}, crds_observatory="foo")
+    assert reftypes[-1] == "pars-simplestep"
+    assert len(reftypes) == 4
+
+
+@pytest.mark.parametrize(
+    "kwargs, expected",
+    [
+        ({}, "step_SimpleStepsimplestep_simplestep.simplestep"),
+        ({"suffix": False}, "step_SimpleStepsimplestep.simplestep"),
+        ({"suffix": "cal"}, "step_SimpleStepsimplestep_cal.simplestep"),
+        ({"basepath": "dir/foo.json", "ext": ".asdf"}, "foo_simplestep.asdf"),
+        (
+            {"basepath": "foo.json", "idx": 1, "skipped": None},
+            "foo_1_simplestep.simplestep",
+        ),
+        ({"basepath": "foo", "suffix": False, "a": "b"}, "foo_b.simplestep"),
+    ],
+)
+def test_make_output_path(kwargs, expected):
+    """Output names are built from basename, components, suffix and extension"""
+    assert SimpleStep().make_output_path(**kwargs) == expected
+
+
+@pytest.mark.parametrize(
+    "file_path, expected",
+    [
+        ("foo.asdf", str(Path("indir") / "foo.asdf")),
+        (str(Path("other") / "foo.asdf"), str(Path("other") / "foo.asdf")),
+        (None, None),
+    ],
+)
+def test_make_input_path(file_path, expected):
+    """Only file names without a directory are placed in input_dir"""
+    step = SimpleStep()
+    step.input_dir = "indir"
+    assert step.make_input_path(file_path) == expected
+
+
+def test_precache_references(monkeypatch, tmp_path):
+    """Pipelines prefetch all non-overridden reftypes in a single CRDS call"""
+
+    class RefStep(SimpleStep):
+        reference_file_types: ClassVar = ["flat", "dark"]
+
+    class RefPipe(Pipeline):
+        spec = """
+            output_ext = string(default='refpipe')
+        """
+        step_defs: ClassVar = {"step1": RefStep, "step2": RefStep}
+
+    override_path = tmp_path / "dark.asdf"
+    override_path.touch()
+    pipe = RefPipe()
+    pipe.step2.override_dark = str(override_path)
+
+    fetched = []
+
+    def get_multiple_reference_paths(parameters, reference_file_types, observatory):
+        fetched.append(reference_file_types)
+        return dict.fromkeys(reference_file_types, "N/A")
+
+    monkeypatch.setattr(
+        RefPipe, "_get_crds_parameters", staticmethod(lambda dataset: ({}, "jwst"))
+    )
+    monkeypatch.setattr(
+        crds_client, "get_multiple_reference_paths", get_multiple_reference_paths
+    )
+    pipe._precache_references("foo.asdf")
+    assert fetched == [["flat"]]
+
+
+def test_make_output_path_output_dir(monkeypatch):
+    """The output directory is expanded and prepended to the file name"""
+    monkeypatch.setenv("STPIPE_TEST_OUTPUT", "expanded")
+    step = SimpleStep()
+    step.output_dir = str(Path("$STPIPE_TEST_OUTPUT") / "out")
+    assert step.make_output_path(basepath="foo.json") == str(
+        Path("expanded") / "out" / "foo_simplestep.simplestep"
+    )